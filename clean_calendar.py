@@ -1,9 +1,11 @@
 # clean_calendar_secure.py - SECURE VERSION
+import argparse
 import os
 import json
 import base64
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from profiling import Profiler, DEFAULT_PROFILE_DIR
 
 # ==========================================================
 # Φόρτωσε το .env αρχείο
@@ -123,8 +125,10 @@ def secure_confirmation(action_description, item_count):
     
     return True
 
-def delete_all_events(service, events):
+def delete_all_events(service, events, profiler=None):
     """Διαγραφή ΟΛΩΝ των events με ασφάλεια"""
+    profiler = profiler or Profiler()
+    
     if not events:
         print("ℹ️ Το calendar είναι ήδη κενό!")
         return
@@ -135,32 +139,63 @@ def delete_all_events(service, events):
     deleted_count = 0
     print("\n🗑️  Διαγραφή events...")
     
-    for i, event in enumerate(events, 1):
-        try:
-            summary = event.get('summary', 'ΧΩΡΙΣ ΤΙΤΛΟ')
-            safe_summary = summary.replace(CALENDAR_ID, "***") if CALENDAR_ID in summary else summary[:50]
+    # Profiling μόνο του loop διαγραφής (όχι της επιβεβαίωσης από τον χρήστη)
+    with profiler.phase("delete_all_events"):
+        for i, event in enumerate(events, 1):
+            try:
+                summary = event.get('summary', 'ΧΩΡΙΣ ΤΙΤΛΟ')
+                safe_summary = summary.replace(CALENDAR_ID, "***") if CALENDAR_ID in summary else summary[:50]
             
-            service.events().delete(
-                calendarId=CALENDAR_ID,
-                eventId=event['id']
-            ).execute()
+                service.events().delete(
+                    calendarId=CALENDAR_ID,
+                    eventId=event['id']
+                ).execute()
             
-            deleted_count += 1
-            print(f"{i:3d}/{len(events)} Διαγράφηκε: {safe_summary}...")
+                deleted_count += 1
+                print(f"{i:3d}/{len(events)} Διαγράφηκε: {safe_summary}...")
             
-        except Exception as e:
-            print(f"⚠️ Σφάλμα: {e}")
+            except Exception as e:
+                print(f"⚠️ Σφάλμα: {e}")
     
     print(f"\n✅ Διαγράφηκαν {deleted_count} από {len(events)} events")
 
+def parse_args():
+    """Παράμετροι γραμμής εντολών"""
+    parser = argparse.ArgumentParser(description="Google Calendar Cleaner")
+    parser.add_argument(
+        "--profile", nargs="?", const=DEFAULT_PROFILE_DIR, default=None, metavar="DIR",
+        help=f"Profiling ανά φάση (cProfile) στον φάκελο DIR (default: {DEFAULT_PROFILE_DIR})",
+    )
+    parser.add_argument(
+        "--profile-memory", action="store_true",
+        help="Με --profile: και tracemalloc snapshots ανά φάση (επιβραδύνει τους χρόνους του cProfile)",
+    )
+    args = parser.parse_args()
+    
+    if args.profile_memory and args.profile is None:
+        parser.error("argument --profile-memory: requires --profile")
+    return args
+
 def main():
     """Κύριο μενού"""
+    args = parse_args()
+    profiler = Profiler(enabled=args.profile is not None, output_dir=args.profile or DEFAULT_PROFILE_DIR, log=print,
+                        trace_memory=args.profile_memory)
+    
+    try:
+        run_menu(profiler)
+    finally:
+        profiler.close()
+
+def run_menu(profiler):
+    """Διαδραστικό μενού επιλογών"""
     print("=" * 60)
     print("🗑️  GOOGLE CALENDAR CLEANER (SECURE)")
     print("=" * 60)
     
     try:
-        service = authenticate_google_calendar()
+        with profiler.phase("auth"):
+            service = authenticate_google_calendar()
     except Exception:
         return
     
@@ -175,12 +210,14 @@ def main():
         choice = input("\n👉 Επίλεξε (1-3): ").strip()
         
         if choice == '1':
-            events = list_events(service)
+            with profiler.phase("list_events"):
+                events = list_events(service)
             input("\n👆 Πάτησε Enter...")
             
         elif choice == '2':
-            events = list_events(service)
-            delete_all_events(service, events)
+            with profiler.phase("list_events"):
+                events = list_events(service)
+            delete_all_events(service, events, profiler)
             input("\n👆 Πάτησε Enter...")
             
         elif choice == '3':
@@ -1,6 +1,10 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import gzip
+import shutil
+import tempfile
 import json
 import base64
 import os
@@ -9,6 +13,7 @@ from google.oauth2 import service_account
 from googleapiclient.discovery import build
 import logging
 import re
+from profiling import Profiler, DEFAULT_PROFILE_DIR
 
 # ==========================================================
 # LOGGING SETUP
@@ -37,6 +42,8 @@ SCOPES = ["https://www.googleapis.com/auth/calendar"]
 BASE_URL = "https://www.paobc.gr/schedule/page/"
 MAX_PAGES = 10
 REQUEST_TIMEOUT = 15
+SNAPSHOT_VERSION = 2
+SNAPSHOT_MATCH_FIELDS = ("date", "time", "home_team", "away_team")
 
 
 def normalize_team_name(name):
@@ -84,8 +91,13 @@ def authenticate_google_calendar():
         sys.exit(1)
 
 
-def scrape_pao_schedule():
-    """Σάρωση προγράμματος από paobc.gr"""
+def scrape_pao_schedule(pages=None):
+    """
+    Σάρωση προγράμματος από paobc.gr
+
+    Αν δοθεί λίστα pages, προστίθεται σε αυτή το raw HTML κάθε σελίδας,
+    αποκωδικοποιημένο όπως το είδε ο parser (για αποθήκευση σε snapshot).
+    """
     all_matches = []
     seen_matches = set()
     page = 1
@@ -101,6 +113,15 @@ def scrape_pao_schedule():
             response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, "html.parser")
+            if pages is not None:
+                # Αποθήκευση με το encoding που ανίχνευσε ο parser (όχι response.text)
+                encoding = soup.original_encoding or "utf-8"
+                pages.append({
+                    "page": page,
+                    "url": url,
+                    "encoding": encoding,
+                    "body": response.content.decode(encoding, errors="replace"),
+                })
             matches = soup.find_all("div", class_="game")
 
             if not matches:
@@ -167,6 +188,153 @@ def scrape_pao_schedule():
     return all_matches
 
 
+def _write_atomically(path, writer):
+    """Εγγραφή σε προσωρινό αρχείο στον ίδιο φάκελο και os.replace στο path"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_snapshot(path, matches, pages):
+    """
+    Αποθήκευση scrape σε συμπιεσμένο (gzip) snapshot.
+
+    Μορφή: 1η γραμμή JSON με version / created_at / source / matches
+    (κάθε αγώνας με το υπολογισμένο "key"), 2η γραμμή JSON με τις raw σελίδες.
+    Έτσι η σύγκριση snapshots διαβάζει μόνο την 1η γραμμή.
+    """
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "source": BASE_URL,
+        "matches": [dict(match, key=snapshot_match_key(match)) for match in matches],
+    }
+    
+    def write(tmp_path):
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False, separators=(",", ":")) + "\n")
+            f.write(json.dumps(pages, ensure_ascii=False, separators=(",", ":")) + "\n")
+    
+    _write_atomically(path, write)
+    logger.info(f"💾 Snapshot αποθηκεύτηκε: {path} ({len(matches)} αγώνες, {len(pages)} σελίδες)")
+
+
+def copy_snapshot(src_path, dst_path):
+    """Αντιγραφή υπάρχοντος snapshot (χωρίς αλλαγή του created_at)"""
+    _write_atomically(dst_path, lambda tmp_path: shutil.copyfile(src_path, tmp_path))
+    logger.info(f"💾 Snapshot αντιγράφηκε: {src_path} → {dst_path}")
+
+
+def load_snapshot(path):
+    """
+    Φόρτωση snapshot με έλεγχο έκδοσης και δομής.
+    Διαβάζεται μόνο η 1η γραμμή (χωρίς τις raw σελίδες).
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        snapshot = json.loads(f.readline())
+    
+    if not isinstance(snapshot, dict):
+        raise ValueError(f"Μη έγκυρο snapshot στο {path}")
+    version = snapshot.get("version")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Μη υποστηριζόμενη έκδοση snapshot {version} στο {path} "
+                         f"(αναμενόταν {SNAPSHOT_VERSION})")
+    if not isinstance(snapshot.get("matches"), list):
+        raise ValueError(f"Το snapshot {path} δεν περιέχει λίστα 'matches'")
+    for i, match in enumerate(snapshot["matches"]):
+        if not isinstance(match, dict) or not all(isinstance(match.get(f), str) for f in SNAPSHOT_MATCH_FIELDS):
+            raise ValueError(f"Μη έγκυρος αγώνας #{i} στο snapshot {path} "
+                             f"(απαιτούνται: {', '.join(SNAPSHOT_MATCH_FIELDS)})")
+    
+    created_at = snapshot.get("created_at")
+    if created_at is not None:
+        try:
+            datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise ValueError(f"Μη έγκυρο created_at '{created_at}' στο snapshot {path}")
+    return snapshot
+
+
+def snapshot_age_minutes(snapshot):
+    """Ηλικία snapshot σε λεπτά (None αν λείπει το created_at)"""
+    if not snapshot.get("created_at"):
+        return None
+    created_at = datetime.fromisoformat(snapshot["created_at"])
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - created_at).total_seconds() / 60
+
+
+def snapshot_match_key(match):
+    """
+    Key αγώνα για σύγκριση snapshots, ίδιο με του συγχρονισμού.
+    None αν η ημερομηνία δεν αναλύεται (τέτοιους αγώνες τους αγνοεί και ο συγχρονισμός).
+    """
+    match_dt = parse_match_datetime(match["date"], match["time"])
+    if match_dt:
+        return create_match_key(match["home_team"], match["away_team"], match_dt)
+    return None
+
+
+def _snapshot_key_map(snapshot):
+    """Map key -> αγώνας και λίστα αγώνων χωρίς έγκυρη ημερομηνία"""
+    key_map = {}
+    unparseable = []
+    for match in snapshot["matches"]:
+        key = match["key"] if "key" in match else snapshot_match_key(match)
+        if key is None:
+            unparseable.append(match)
+        else:
+            key_map[key] = match
+    return key_map, unparseable
+
+
+def diff_snapshots(old_snapshot, new_snapshot):
+    """
+    Σύγκριση δύο snapshots.
+    Επιστρέφει dict με added / removed / changed λίστες αγώνων (ταξινομημένες κατά key)
+    και unparseable: αγώνες του νέου snapshot χωρίς έγκυρη ημερομηνία.
+    """
+    old_map, _ = _snapshot_key_map(old_snapshot)
+    new_map, unparseable = _snapshot_key_map(new_snapshot)
+    
+    added = [new_map[key] for key in sorted(new_map.keys() - old_map.keys())]
+    removed = [old_map[key] for key in sorted(old_map.keys() - new_map.keys())]
+    changed = []
+    for key in sorted(old_map.keys() & new_map.keys()):
+        old_match, new_match = old_map[key], new_map[key]
+        fields = [f for f in ("time", "venue", "competition") if old_match.get(f) != new_match.get(f)]
+        if fields:
+            changed.append((old_match, new_match, fields))
+    
+    return {"added": added, "removed": removed, "changed": changed, "unparseable": unparseable}
+
+
+def log_snapshot_diff(diff):
+    """Εμφάνιση διαφορών snapshots"""
+    for match in diff["added"]:
+        logger.info(f"✅ ΝΕΟΣ: {match['home_team']} vs {match['away_team']} ({match['date']} {match['time']})")
+    for match in diff["removed"]:
+        logger.info(f"🗑️ ΑΦΑΙΡΕΘΗΚΕ: {match['home_team']} vs {match['away_team']} ({match['date']} {match['time']})")
+    for old_match, new_match, fields in diff["changed"]:
+        changes = ", ".join(f"{f}: {old_match.get(f)} → {new_match.get(f)}" for f in fields)
+        logger.info(f"🔄 ΑΛΛΑΓΗ: {new_match['home_team']} vs {new_match['away_team']} ({changes})")
+    for match in diff["unparseable"]:
+        logger.warning(f"⚠️ ΧΩΡΙΣ ΗΜΕΡΟΜΗΝΙΑ: {match['home_team']} vs {match['away_team']} "
+                       f"('{match['date']} {match['time']}') - αγνοείται από τον συγχρονισμό")
+    
+    logger.info(f"📊 Νέοι: {len(diff['added'])}, Αφαιρέθηκαν: {len(diff['removed'])}, "
+                f"Άλλαξαν: {len(diff['changed'])}, Χωρίς ημερομηνία: {len(diff['unparseable'])}")
+
+
 def parse_match_datetime(date_text, time_text):
     """Μετατροπή ημερομηνίας σε datetime object"""
     try:
@@ -287,10 +455,13 @@ def create_match_key(home_team, away_team, match_datetime):
     return f"{teams_sorted[0]}|{teams_sorted[1]}|{date_str}"
 
 
-def sync_calendar_with_website(service, website_matches):
+def sync_calendar_with_website(service, website_matches, dry_run=False):
     """
     Κύριος αλγόριθμος συγχρονισμού
+    Με dry_run=True γίνεται μόνο ανάγνωση του ημερολογίου και καταγραφή
+    των αλλαγών που θα γίνονταν (χωρίς insert / update / delete).
     """
+    prefix = "[DRY RUN] " if dry_run else ""
     
     # =========================================================================
     # ΒΗΜΑ 1: Φόρτωση όλων των δεδομένων στη μνήμη
@@ -385,13 +556,14 @@ def sync_calendar_with_website(service, website_matches):
                     },
                 }
                 
-                service.events().update(
-                    calendarId=CALENDAR_ID,
-                    eventId=cal_info["event_id"],
-                    body=event_data
-                ).execute()
+                if not dry_run:
+                    service.events().update(
+                        calendarId=CALENDAR_ID,
+                        eventId=cal_info["event_id"],
+                        body=event_data
+                    ).execute()
                 
-                logger.info(f"🔄 ΕΝΗΜΕΡΩΣΗ: {cal_info['home']} vs {cal_info['away']} "
+                logger.info(f"{prefix}🔄 ΕΝΗΜΕΡΩΣΗ: {cal_info['home']} vs {cal_info['away']} "
                            f"({cal_info['datetime'].strftime('%H:%M')} → {site_info['datetime'].strftime('%H:%M')})")
                 updated_count += 1
             
@@ -399,12 +571,13 @@ def sync_calendar_with_website(service, website_matches):
             processed_site_keys.add(cal_key)
         else:
             # ΔΕΝ βρέθηκε στο site - DELETE
-            service.events().delete(
-                calendarId=CALENDAR_ID,
-                eventId=cal_info["event_id"]
-            ).execute()
+            if not dry_run:
+                service.events().delete(
+                    calendarId=CALENDAR_ID,
+                    eventId=cal_info["event_id"]
+                ).execute()
             
-            logger.info(f"🗑️ ΔΙΑΓΡΑΦΗ: {cal_info['home']} vs {cal_info['away']} "
+            logger.info(f"{prefix}🗑️ ΔΙΑΓΡΑΦΗ: {cal_info['home']} vs {cal_info['away']} "
                        f"({cal_info['datetime'].strftime('%d/%m/%Y')}) - δεν υπάρχει πια στο site")
             deleted_count += 1
     
@@ -441,9 +614,10 @@ def sync_calendar_with_website(service, website_matches):
                 },
             }
             
-            service.events().insert(calendarId=CALENDAR_ID, body=event_data).execute()
+            if not dry_run:
+                service.events().insert(calendarId=CALENDAR_ID, body=event_data).execute()
             
-            logger.info(f"✅ ΠΡΟΣΘΗΚΗ: {site_info['home']} vs {site_info['away']} "
+            logger.info(f"{prefix}✅ ΠΡΟΣΘΗΚΗ: {site_info['home']} vs {site_info['away']} "
                        f"({site_info['datetime'].strftime('%d/%m/%Y %H:%M')})")
             added_count += 1
     
@@ -451,7 +625,7 @@ def sync_calendar_with_website(service, website_matches):
     # ΣΥΝΟΨΗ
     # =========================================================================
     logger.info("\n" + "="*70)
-    logger.info("✅ ΟΛΟΚΛΗΡΩΘΗΚΕ ΕΠΙΤΥΧΩΣ!")
+    logger.info(f"{prefix}✅ ΟΛΟΚΛΗΡΩΘΗΚΕ ΕΠΙΤΥΧΩΣ!")
     logger.info(f"  • Αγώνες στο site: {len(site_map)}")
     logger.info(f"  • Ενημερώθηκαν: {updated_count}")
     logger.info(f"  • Διαγράφηκαν: {deleted_count}")
@@ -460,28 +634,128 @@ def sync_calendar_with_website(service, website_matches):
     logger.info("="*70)
 
 
-def main():
-    """Κύρια συνάρτηση"""
-    logger.info("="*70)
-    logger.info("🏀 Panathinaikos BC Schedule Scraper")
-    logger.info("="*70)
+def parse_args():
+    """Ανάγνωση παραμέτρων γραμμής εντολών"""
+    parser = argparse.ArgumentParser(description="Panathinaikos BC Schedule Scraper")
+    parser.add_argument(
+        "--profile", nargs="?", const=DEFAULT_PROFILE_DIR, default=None, metavar="DIR",
+        help=f"Profiling ανά φάση (cProfile) στον φάκελο DIR (default: {DEFAULT_PROFILE_DIR})",
+    )
+    parser.add_argument(
+        "--profile-memory", action="store_true",
+        help="Με --profile: και tracemalloc snapshots ανά φάση (επιβραδύνει τους χρόνους του cProfile)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Καταγραφή των αλλαγών στο ημερολόγιο χωρίς εγγραφή (π.χ. για replay από snapshot)",
+    )
+    source_group = parser.add_mutually_exclusive_group()
+    source_group.add_argument(
+        "--snapshot", metavar="PATH",
+        help="Συγχρονισμός από snapshot αντί για σάρωση. Αν το αρχείο λείπει ή είναι παλιό, "
+             "γίνεται σάρωση και αποθηκεύεται εκεί",
+    )
+    parser.add_argument(
+        "--snapshot-max-age", type=float, metavar="MINUTES",
+        help="Μέγιστη ηλικία του --snapshot για να χρησιμοποιηθεί (default: χωρίς όριο)",
+    )
+    parser.add_argument(
+        "--save-snapshot", metavar="PATH",
+        help="Αποθήκευση της σάρωσης σε snapshot",
+    )
+    source_group.add_argument(
+        "--diff-snapshots", nargs=2, metavar=("OLD", "NEW"),
+        help="Σύγκριση δύο snapshots και έξοδος (χωρίς συγχρονισμό)",
+    )
+    args = parser.parse_args()
     
-    # Ταυτοποίηση
-    service = authenticate_google_calendar()
+    if args.diff_snapshots and args.dry_run:
+        parser.error("argument --dry-run: not allowed with argument --diff-snapshots")
+    if args.diff_snapshots and args.save_snapshot:
+        parser.error("argument --save-snapshot: not allowed with argument --diff-snapshots")
+    if args.profile_memory and args.profile is None:
+        parser.error("argument --profile-memory: requires --profile")
+    if args.snapshot_max_age is not None and not args.snapshot:
+        parser.error("argument --snapshot-max-age: requires --snapshot")
+    return args
+
+
+def load_website_matches(args):
+    """Αγώνες από snapshot (αν υπάρχει και είναι πρόσφατο) ή από σάρωση του site"""
+    if args.snapshot and os.path.exists(args.snapshot):
+        snapshot = None
+        try:
+            snapshot = load_snapshot(args.snapshot)
+        except (OSError, EOFError, json.JSONDecodeError, ValueError) as e:
+            logger.warning(f"⚠️ Μη αναγνώσιμο snapshot {args.snapshot}: {e} - νέα σάρωση")
+        
+        if snapshot is not None:
+            age = snapshot_age_minutes(snapshot) if args.snapshot_max_age is not None else None
+            if args.snapshot_max_age is None or (age is not None and age <= args.snapshot_max_age):
+                age_text = f", ηλικία {age:.0f} λεπτά" if age is not None else ""
+                logger.info(f"📂 Replay από snapshot {args.snapshot} "
+                            f"({len(snapshot['matches'])} αγώνες{age_text})")
+                if args.save_snapshot and os.path.abspath(args.save_snapshot) != os.path.abspath(args.snapshot):
+                    try:
+                        copy_snapshot(args.snapshot, args.save_snapshot)
+                    except OSError as e:
+                        logger.error(f"Σφάλμα αποθήκευσης snapshot {args.save_snapshot}: {e}")
+                return snapshot["matches"]
+            age_text = f"{age:.0f} λεπτά" if age is not None else "άγνωστη ηλικία"
+            logger.info(f"Το snapshot {args.snapshot} είναι παλιό ({age_text}) - νέα σάρωση")
     
-    # Σάρωση website
     logger.info("\n" + "="*70)
     logger.info("Σάρωση προγράμματος από paobc.gr")
     logger.info("="*70)
     
-    website_matches = scrape_pao_schedule()
+    save_paths = list(dict.fromkeys(path for path in (args.snapshot, args.save_snapshot) if path))
+    pages = [] if save_paths else None
+    website_matches = scrape_pao_schedule(pages=pages)
     
-    if not website_matches:
-        logger.error("❌ Δεν βρέθηκαν αγώνες - τερματισμός")
-        sys.exit(1)
+    if website_matches:
+        for path in save_paths:
+            try:
+                save_snapshot(path, website_matches, pages)
+            except OSError as e:
+                logger.error(f"Σφάλμα αποθήκευσης snapshot {path}: {e}")
+    return website_matches
+
+
+def main():
+    """Κύρια συνάρτηση"""
+    args = parse_args()
+    profiler = Profiler(enabled=args.profile is not None, output_dir=args.profile or DEFAULT_PROFILE_DIR,
+                        trace_memory=args.profile_memory)
+
+    logger.info("="*70)
+    logger.info("🏀 Panathinaikos BC Schedule Scraper")
+    logger.info("="*70)
     
-    # Συγχρονισμός
-    sync_calendar_with_website(service, website_matches)
+    try:
+        # Σύγκριση snapshots
+        if args.diff_snapshots:
+            old_path, new_path = args.diff_snapshots
+            with profiler.phase("diff"):
+                log_snapshot_diff(diff_snapshots(load_snapshot(old_path), load_snapshot(new_path)))
+            return
+        
+        # Ταυτοποίηση
+        with profiler.phase("auth"):
+            service = authenticate_google_calendar()
+        
+        # Σάρωση website (ή replay από snapshot)
+        with profiler.phase("scrape"):
+            website_matches = load_website_matches(args)
+        
+        if not website_matches:
+            logger.error("❌ Δεν βρέθηκαν αγώνες - τερματισμός")
+            sys.exit(1)
+        
+        # Συγχρονισμός
+        with profiler.phase("sync"):
+            sync_calendar_with_website(service, website_matches, dry_run=args.dry_run)
+    finally:
+        profiler.close()
 
 
 if __name__ == "__main__":
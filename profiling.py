@@ -0,0 +1,139 @@
+import cProfile
+import contextlib
+import logging
+import os
+import pstats
+import re
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# ==========================================================
+# ΡΥΘΜΙΣΕΙΣ
+# ==========================================================
+DEFAULT_PROFILE_DIR = "profiles"
+TOP_N = 15
+TRACEMALLOC_FRAMES = 25
+
+# Frames του ίδιου του profiler που δεν εμφανίζονται στις συνόψεις
+PROFILER_FILES = {os.path.abspath(__file__), os.path.abspath(contextlib.__file__)}
+
+
+class Profiler:
+    """
+    Profiling ανά φάση εκτέλεσης (cProfile και, προαιρετικά, tracemalloc).
+
+    Για κάθε φάση γράφονται στο output_dir:
+      • <NN>_<φάση>.prof               -> pstats αρχείο (snakeviz, gprof2dot, pstats)
+    και με trace_memory=True επιπλέον:
+      • <NN>_<φάση>.before.tracemalloc -> snapshot πριν τη φάση
+      • <NN>_<φάση>.tracemalloc        -> snapshot μετά τη φάση
+    (after.compare_to(before, ...) δίνει τις allocations της φάσης).
+    Στο log εμφανίζεται σύνοψη με τις top-N συναρτήσεις και allocations.
+
+    Το tracemalloc επιβαρύνει πολύ τον κώδικα με πολλές allocations, άρα
+    με trace_memory=True οι χρόνοι του cProfile δεν είναι αντιπροσωπευτικοί.
+
+    Όταν enabled=False, το phase() επιστρέφει nullcontext και δεν
+    ενεργοποιείται ούτε cProfile ούτε tracemalloc.
+    """
+
+    def __init__(self, enabled=False, output_dir=DEFAULT_PROFILE_DIR, top_n=TOP_N, log=logger.info,
+                 trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.log = log
+        self._phase_index = 0
+
+        if self.enabled:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.log(f"🔬 Profiling ενεργό - αρχεία στο '{self.output_dir}/'")
+        if self.trace_memory:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.log("🔬 tracemalloc ενεργό - οι χρόνοι του cProfile είναι διογκωμένοι")
+
+    def phase(self, name):
+        """Context manager για profiling μιας φάσης"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._profile_phase(name)
+
+    @contextlib.contextmanager
+    def _profile_phase(self, name):
+        self._phase_index += 1
+        safe_name = re.sub(r'[^\w-]', '_', name)
+        base_path = os.path.join(self.output_dir, f"{self._phase_index:02d}_{safe_name}")
+
+        snapshot_before = tracemalloc.take_snapshot() if self.trace_memory else None
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            profile.dump_stats(f"{base_path}.prof")
+
+            self.log(f"🔬 Profile φάσης '{name}': {elapsed:.3f}s")
+            self._log_hot_functions(profile)
+
+            if self.trace_memory:
+                snapshot_after = tracemalloc.take_snapshot()
+                snapshot_before.dump(f"{base_path}.before.tracemalloc")
+                snapshot_after.dump(f"{base_path}.tracemalloc")
+                self._log_allocations(snapshot_before, snapshot_after)
+
+    def _log_hot_functions(self, profile):
+        """Top-N συναρτήσεις ταξινομημένες κατά self time"""
+        stats = pstats.Stats(profile).stats
+        app_stats = [item for item in stats.items() if not _is_profiler_entry(*item)]
+        hot = sorted(app_stats, key=lambda item: item[1][2], reverse=True)[:self.top_n]
+
+        self.log(f"   Top {len(hot)} συναρτήσεις (self / cumulative / calls):")
+        for (filename, line, func), (_, calls, self_time, cum_time, _) in hot:
+            location = f" ({os.path.basename(filename)}:{line})" if line else ""
+            self.log(f"   {self_time:8.3f}s {cum_time:8.3f}s {calls:8d}  {func}{location}")
+
+    def _log_allocations(self, snapshot_before, snapshot_after):
+        """Top-N γραμμές κώδικα με τη μεγαλύτερη αύξηση μνήμης"""
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, contextlib.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+        diff = snapshot_after.filter_traces(filters).compare_to(
+            snapshot_before.filter_traces(filters), "lineno"
+        )
+
+        self.log(f"   Top {min(self.top_n, len(diff))} allocations (Δ μέγεθος / Δ blocks):")
+        for stat in diff[:self.top_n]:
+            frame = stat.traceback[0]
+            self.log(f"   {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d}  "
+                     f"{os.path.basename(frame.filename)}:{frame.lineno}")
+
+    def close(self):
+        """Τερματισμός tracemalloc"""
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def _is_profiler_entry(func_key, func_stats):
+    """
+    Αν μια εγγραφή pstats ανήκει στον profiler: συναρτήσεις των
+    profiling.py / contextlib.py ή built-ins που καλούνται μόνο από αυτά
+    (π.χ. next(), _lsprof.Profiler.disable).
+    """
+    filename, line, func = func_key
+    if os.path.abspath(filename) in PROFILER_FILES or "_lsprof" in func:
+        return True
+    if line == 0:
+        callers = func_stats[4]
+        return bool(callers) and all(
+            os.path.abspath(caller[0]) in PROFILER_FILES for caller in callers
+        )
+    return False